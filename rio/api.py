@@ -4,9 +4,10 @@ import functools
 
 import mock
 
-from typing import Any, Optional
+from typing import Any, Iterable, Optional, Union
 
 from .pipes import Client
+from .cache import MetadataCache, Invalidator
 from .log import get_logger
 
 
@@ -34,10 +35,45 @@ class PatchedClient(Client):
             Used for the zerorpc.Client as the timeout value.
         heartbeat : float
         passive_heartbeat : bool
+        max_in_flight : int
+            Maximum number of concurrent calls issued via `submit`.
+        readahead : int
+            Minimum number of bytes read at a time from remote files.
+        writebuffer : int
+            Number of bytes written to remote files are buffered up to.
+        cache : Union[bool, MetadataCache]
+            Cache results of remote calls. If True a cache suitable for the
+            `rio.collections.fs` methods is used.
+        watch : Optional[Iterable[str]]
+            Server paths to subscribe to changes for while the context is
+            entered. Changed paths are evicted from the cache.
         """
+        cache = kwargs.pop('cache', None)
+        watch = kwargs.pop('watch', None)
+        if cache is True:
+            from .collections.fs import iterfsttls, iterfsmutators
+            cache = MetadataCache(ttls=dict(iterfsttls()),
+                                  mutators=dict(iterfsmutators()))
+        elif cache is False:
+            cache = None
+        self.cache = cache  # type: Optional[MetadataCache]
+
         super(PatchedClient, self).__init__(**kwargs)
         self._ctxs = []  # List[mock._patch]
 
+        self._invalidator = None  # type: Optional[Invalidator]
+        if watch:
+            if self.cache is None:
+                raise ValueError('Watching paths requires a cache')
+            self._invalidator = Invalidator(self, self.cache, watch)
+
+    def __call__(self, method, *args, **kwargs):
+        call = super(PatchedClient, self).__call__
+        if self.cache is None or method.startswith('_') \
+                or kwargs.get('async'):
+            return call(method, *args, **kwargs)
+        return self.cache.call(call, method, *args, **kwargs)
+
     def __iter__(self):
         # Yield `mock._patch` context managers for all methods hosted by the
         # server.
@@ -56,6 +92,8 @@ class PatchedClient(Client):
                 side_effect=functools.partial(self, func_name))
 
     def __enter__(self):
+        if self._invalidator is not None:
+            self._invalidator.start()
         for ctx in iter(self):
             try:
                 ctx.__enter__()
@@ -66,6 +104,9 @@ class PatchedClient(Client):
         return super(PatchedClient, self).__enter__()
 
     def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._invalidator is not None:
+            self._invalidator.stop()
+        self._closefiles()
         if self._ctxs:
             for ctx in reversed(self._ctxs):
                 ctx.__exit__()
@@ -74,7 +115,7 @@ class PatchedClient(Client):
 
 
 def rio(connect_to, context=None, timeout=8.0, heartbeat=5.0,
-        passive_heartbeat=True):
+        passive_heartbeat=True, cache=None, watch=None):
     """
     Get a context manager for executing remote methods.
 
@@ -85,6 +126,12 @@ def rio(connect_to, context=None, timeout=8.0, heartbeat=5.0,
     timeout : float
     heartbeat : float
     passive_heartbeat : bool
+    cache : Optional[Union[bool, MetadataCache]]
+        Cache results of remote calls. If True a cache suitable for the
+        `rio.collections.fs` methods is used.
+    watch : Optional[Iterable[str]]
+        Server paths to subscribe to changes for. Changed paths are evicted
+        from the cache.
 
     Returns
     -------
@@ -96,5 +143,7 @@ def rio(connect_to, context=None, timeout=8.0, heartbeat=5.0,
         'timeout': timeout,
         'heartbeat': heartbeat,
         'passive_heartbeat': passive_heartbeat,
+        'cache': cache,
+        'watch': watch,
     }
     return PatchedClient(**kwargs)
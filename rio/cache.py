@@ -0,0 +1,276 @@
+"""
+Client-side caching of remote call results.
+"""
+from __future__ import absolute_import, print_function
+
+import os
+import time
+import errno
+import collections
+
+import gevent
+import gevent.event
+import pathlib
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .log import get_logger
+
+
+_logger = get_logger(__name__)
+
+
+__all__ = [
+    'MetadataCache',
+    'Invalidator',
+]
+
+
+try:
+    string_types = (basestring,)
+except NameError:
+    string_types = (str, bytes)
+
+
+def topath(value):
+    """
+    Get the normalized path for a path-like argument.
+
+    Parameters
+    ----------
+    value : Any
+
+    Returns
+    -------
+    Optional[str]
+        None if `value` is not path-like.
+    """
+    if isinstance(value, pathlib.PurePath):
+        value = str(value)
+    if isinstance(value, string_types):
+        return os.path.normpath(value)
+    return None
+
+
+class MetadataCache(object):
+    """
+    Bounded LRU cache with a per-method time-to-live for the results of remote
+    calls.
+
+    Only methods with a configured ttl are cached, keyed by the method name
+    and its args. Missing paths (OSError/IOError with ENOENT) are cached as
+    well so repeated existence checks stay local. Calling a mutating method
+    evicts all entries for the paths it modifies along with the entries of
+    their parent directories.
+    """
+
+    def __init__(self, ttls=None, mutators=None, maxsize=4096, negative=True):
+        """
+        Parameters
+        ----------
+        ttls : Optional[Dict[str, float]]
+            Time-to-live in seconds for each cacheable method.
+        mutators : Optional[Dict[str, Callable[[tuple, dict], Iterable[Any]]]]
+            Methods that modify paths, mapped to a callable that returns the
+            paths modified by a call given its args and kwargs.
+        maxsize : int
+            Maximum number of cached entries.
+        negative : bool
+            Cache missing path errors.
+        """
+        self.ttls = dict(ttls or {})
+        self.mutators = dict(mutators or {})
+        self.maxsize = maxsize
+        self.negative = negative
+        self.hits = 0
+        self.misses = 0
+        # key -> (expires, path, is_error, value)
+        self._entries = collections.OrderedDict()
+        # path -> set of keys
+        self._paths = {}  # type: Dict[str, set]
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def key(method, args, kwargs):
+        """
+        Get the cache key for a call.
+
+        Returns
+        -------
+        Optional[Tuple[Any, ...]]
+            None if the call args are not hashable.
+        """
+        key = (method, args, frozenset(kwargs.items()) if kwargs else None)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def _get(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        if entry[0] < time.time():
+            self._unindex(key, entry[1])
+            return None
+        # Re-insert to mark the entry as most recently used.
+        self._entries[key] = entry
+        return entry
+
+    def _set(self, key, ttl, args, is_error, value):
+        path = topath(args[0]) if args else None
+        self._entries.pop(key, None)
+        self._entries[key] = (time.time() + ttl, path, is_error, value)
+        if path is not None:
+            self._paths.setdefault(path, set()).add(key)
+        while len(self._entries) > self.maxsize:
+            oldkey, entry = self._entries.popitem(last=False)
+            self._unindex(oldkey, entry[1])
+
+    def _unindex(self, key, path):
+        keys = self._paths.get(path)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._paths[path]
+
+    def invalidate(self, path):
+        """
+        Evict all entries for `path` and its parent directory.
+
+        Parameters
+        ----------
+        path : Any
+            A path-like object.
+        """
+        path = topath(path)
+        if path is None:
+            return
+        for p in {path, os.path.dirname(path)}:
+            for key in self._paths.pop(p, ()):
+                self._entries.pop(key, None)
+
+    def clear(self):
+        """
+        Evict all entries.
+        """
+        self._entries.clear()
+        self._paths.clear()
+
+    def call(self, func, method, *args, **kwargs):
+        """
+        Call `func(method, *args, **kwargs)` using cached results if
+        possible.
+
+        Parameters
+        ----------
+        func : Callable[..., Any]
+        method : str
+
+        Returns
+        -------
+        Any
+        """
+        mutator = self.mutators.get(method)
+        if mutator is not None:
+            try:
+                return func(method, *args, **kwargs)
+            finally:
+                for path in mutator(args, kwargs):
+                    self.invalidate(path)
+
+        ttl = self.ttls.get(method)
+        key = None if ttl is None else self.key(method, args, kwargs)
+        if key is None:
+            return func(method, *args, **kwargs)
+
+        entry = self._get(key)
+        if entry is not None:
+            self.hits += 1
+            _, _, is_error, value = entry
+            if is_error:
+                raise value
+            return value
+
+        self.misses += 1
+        try:
+            value = func(method, *args, **kwargs)
+        except (IOError, OSError) as e:
+            if self.negative and e.errno == errno.ENOENT:
+                self._set(key, ttl, args, True, e)
+            raise
+        self._set(key, ttl, args, False, value)
+        return value
+
+
+class Invalidator(object):
+    """
+    Evicts entries from a `MetadataCache` as the server reports changes to
+    paths, which makes long ttls safe when others modify the file system.
+
+    Changes are consumed from the server's `_watch` stream in a background
+    greenlet. If the stream is lost the cache is cleared, since changes may
+    have been missed, and the subscription is retried.
+    """
+
+    def __init__(self, client, cache, prefixes, retry=1.0):
+        """
+        Parameters
+        ----------
+        client : rio.pipes.Client
+        cache : MetadataCache
+        prefixes : Iterable[str]
+            Server paths to subscribe to changes for.
+        retry : float
+            Seconds to wait before subscribing again after losing the stream.
+        """
+        self.client = client
+        self.cache = cache
+        self.prefixes = [str(x) for x in prefixes]
+        self.retry = retry
+        self._greenlet = None  # type: Optional[gevent.Greenlet]
+
+    def _run(self, subscribed):
+        while True:
+            try:
+                stream = self.client('_watch', self.prefixes)
+                # Wait for the acknowledgement so changes made after
+                # subscribing are never missed.
+                next(stream)
+                subscribed.set()
+                for paths in stream:
+                    for path in paths:
+                        self.cache.invalidate(path)
+            except NameError:
+                _logger.warning('{!r} does not support watching paths'.format(
+                    self.client))
+                subscribed.set()
+                return
+            except Exception as e:
+                _logger.warning('Lost invalidation stream: {}'.format(e))
+            self.cache.clear()
+            gevent.sleep(self.retry)
+
+    def start(self):
+        """
+        Subscribe to changes and start evicting entries.
+
+        The subscription is made from a background greenlet since zerorpc
+        kills the greenlet that opened a stream if its heartbeat is lost.
+        """
+        if self._greenlet is not None:
+            return
+        subscribed = gevent.event.Event()
+        self._greenlet = gevent.spawn(self._run, subscribed)
+        subscribed.wait(self.client._timeout)
+
+    def stop(self):
+        """
+        Stop evicting entries.
+        """
+        if self._greenlet is not None:
+            self._greenlet.kill()
+            self._greenlet = None
@@ -4,7 +4,40 @@ Helper for gathering all filesystem methods to be hosted by a rio server.
 import os
 import pathlib
 
-from typing import Iterator, Tuple, Callable
+from typing import Any, Callable, Iterable, Iterator, Tuple
+
+
+# Methods that only read file system metadata mapped to the number of seconds
+# their results may be cached by a client.
+_CACHEABLE = {
+    'stat': 2.0,
+    'lstat': 2.0,
+    'listdir': 2.0,
+    'readlink': 2.0,
+}
+
+
+# Methods that modify the file system mapped to the positions of the path
+# arguments they modify.
+_MUTATING = {
+    'chmod': (0,),
+    'lchmod': (0,),
+    'mkdir': (0,),
+    'rmdir': (0,),
+    'unlink': (0,),
+    'remove': (0,),
+    'rename': (0, 1),
+    'replace': (0, 1),
+    'symlink': (1,),
+    'link': (1,),
+    'utime': (0,),
+}
+
+
+def _iternames(name):
+    # All hosted names of a file system method.
+    yield 'os.{}'.format(name)
+    yield 'pathlib._NormalAccessor.{}'.format(name)
 
 
 def iterfsmethods():
@@ -29,3 +62,58 @@ def iterfsmethods():
         yield fullname, getattr(pathlib._NormalAccessor, name)
 
     yield 'open', open
+
+
+def iterfsttls():
+    """
+    Yield file system methods whose results are safe for a client to cache,
+    along with their default time-to-live in seconds.
+
+    Returns
+    -------
+    Iterator[Tuple[str, float]]
+    """
+    for name, ttl in _CACHEABLE.items():
+        for fullname in _iternames(name):
+            yield fullname, ttl
+
+
+def _argpaths(*positions):
+    def _paths(args, kwargs):
+        return [args[i] for i in positions if i < len(args)]
+    return _paths
+
+
+def _openpaths(args, kwargs):
+    # Only opening a file for writing modifies it.
+    mode = args[1] if len(args) > 1 else kwargs.get('mode', 'r')
+    if args and any(c in mode for c in 'wax+'):
+        return args[:1]
+    return []
+
+
+def _osopenpaths(args, kwargs):
+    # `os.open` takes flags rather than a mode string.
+    flags = args[1] if len(args) > 1 else kwargs.get('flags', os.O_RDONLY)
+    writeflags = os.O_WRONLY | os.O_RDWR | os.O_CREAT | os.O_TRUNC \
+        | os.O_APPEND
+    if args and flags & writeflags:
+        return args[:1]
+    return []
+
+
+def iterfsmutators():
+    """
+    Yield file system methods that modify paths, along with a callable that
+    returns the paths modified by a call given its args and kwargs.
+
+    Returns
+    -------
+    Iterator[Tuple[str, Callable[[tuple, dict], Iterable[Any]]]]
+    """
+    for name, positions in _MUTATING.items():
+        for fullname in _iternames(name):
+            yield fullname, _argpaths(*positions)
+    for fullname in _iternames('open'):
+        yield fullname, _osopenpaths
+    yield 'open', _openpaths
@@ -0,0 +1,295 @@
+"""
+Proxies for files opened on a rio server.
+
+Hosted methods that return file objects (such as `open`) don't send the file
+itself. Instead the server keeps the file open and replies with a
+`FileHandle` which the client turns into a buffered file-like object whose
+reads and writes are forwarded to the server in large chunks.
+"""
+from __future__ import absolute_import, print_function
+
+import io
+import sys
+import uuid
+
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from .log import get_logger
+
+
+_logger = get_logger(__name__)
+
+
+__all__ = [
+    'FileHandle',
+    'FileHandles',
+    'RemoteFile',
+    'remoteopen',
+]
+
+
+PY2 = sys.version_info[0] == 2
+
+if PY2:
+    _filetypes = (io.IOBase, file)
+else:
+    _filetypes = (io.IOBase,)
+
+
+class FileHandle(object):
+    """
+    Reference to a file held open by the server.
+    """
+
+    def __init__(self, id, name, mode, encoding=None, errors=None):
+        """
+        Parameters
+        ----------
+        id : str
+        name : Any
+            The name of the file on the server.
+        mode : str
+        encoding : Optional[str]
+        errors : Optional[str]
+        """
+        self.id = id
+        self.name = name
+        self.mode = mode
+        self.encoding = encoding
+        self.errors = errors
+
+    def __repr__(self):
+        return '<{}({!r}, mode={!r})>'.format(
+            self.__class__.__name__, self.name, self.mode)
+
+    @property
+    def readable(self):
+        return 'r' in self.mode or '+' in self.mode
+
+    @property
+    def writable(self):
+        return any(c in self.mode for c in 'wax+')
+
+    @property
+    def binary(self):
+        return 'b' in self.mode
+
+
+class FileHandles(object):
+    """
+    Server-side table of open files referenced by `FileHandle`s.
+
+    Each file is owned by the client that opened it so all of a client's
+    files can be closed once it disconnects.
+    """
+
+    # Methods of the underlying file that clients may call.
+    OPERATIONS = frozenset([
+        'read', 'write', 'seek', 'tell', 'truncate', 'flush', 'close'])
+
+    def __init__(self, owner=None):
+        """
+        Parameters
+        ----------
+        owner : Optional[Callable[[], Hashable]]
+            Returns the client making the current request.
+        """
+        self._owner = owner or (lambda: None)
+        # id -> (owner, file, binary file)
+        self._files = {}  # type: Dict[str, Tuple[Hashable, Any, Any]]
+
+    def __len__(self):
+        return len(self._files)
+
+    @staticmethod
+    def isfile(obj):
+        """
+        Returns
+        -------
+        bool
+        """
+        return isinstance(obj, _filetypes)
+
+    def add(self, fileobj):
+        """
+        Hold `fileobj` open and get a handle referencing it.
+
+        Parameters
+        ----------
+        fileobj : Any
+
+        Returns
+        -------
+        FileHandle
+        """
+        handle = FileHandle(
+            uuid.uuid4().hex,
+            getattr(fileobj, 'name', None),
+            getattr(fileobj, 'mode', 'r'),
+            encoding=getattr(fileobj, 'encoding', None),
+            errors=getattr(fileobj, 'errors', None))
+        # Text files are read and written as bytes using their underlying
+        # buffer. The client decodes them.
+        self._files[handle.id] = (
+            self._owner(), fileobj, getattr(fileobj, 'buffer', fileobj))
+        return handle
+
+    def __call__(self, id, op, *args):
+        """
+        Call method `op` of the file referenced by `id`.
+
+        Parameters
+        ----------
+        id : str
+        op : str
+        args : *Any
+
+        Returns
+        -------
+        Any
+        """
+        if op not in self.OPERATIONS:
+            raise ValueError('Unsupported file operation {!r}'.format(op))
+        if op == 'close':
+            return self.close(id)
+        try:
+            _, _, fileobj = self._files[id]
+        except KeyError:
+            raise ValueError('I/O operation on closed file')
+        return getattr(fileobj, op)(*args)
+
+    def close(self, id):
+        """
+        Close the file referenced by `id`.
+
+        Parameters
+        ----------
+        id : str
+        """
+        entry = self._files.pop(id, None)
+        if entry is not None:
+            entry[1].close()
+
+    def closeall(self, owner):
+        """
+        Close all files opened by `owner`.
+
+        Parameters
+        ----------
+        owner : Hashable
+        """
+        for id, entry in list(self._files.items()):
+            if entry[0] == owner:
+                try:
+                    self.close(id)
+                except Exception as e:
+                    _logger.warning('Error closing {!r}: {}'.format(
+                        entry[1], e))
+
+
+class RemoteFile(io.RawIOBase):
+    """
+    Unbuffered file-like object whose operations are executed on a file held
+    open by the server. See `remoteopen` for getting a buffered file.
+    """
+
+    def __init__(self, client, handle):
+        """
+        Parameters
+        ----------
+        client : rio.pipes.Client
+        handle : FileHandle
+        """
+        super(RemoteFile, self).__init__()
+        self._client = client
+        self._handle = handle
+
+    def __repr__(self):
+        return '<{}({!r}, mode={!r})>'.format(
+            self.__class__.__name__, self.name, self.mode)
+
+    @property
+    def name(self):
+        return self._handle.name
+
+    @property
+    def mode(self):
+        return self._handle.mode
+
+    def _call(self, op, *args):
+        return self._client('_file', self._handle.id, op, *args)
+
+    def readable(self):
+        return self._handle.readable
+
+    def writable(self):
+        return self._handle.writable
+
+    def seekable(self):
+        return True
+
+    def readinto(self, b):
+        data = self._call('read', len(b))
+        n = len(data)
+        b[:n] = data
+        return n
+
+    def readall(self):
+        return self._call('read', -1)
+
+    def write(self, b):
+        if isinstance(b, memoryview):
+            b = b.tobytes()
+        return self._call('write', bytes(b))
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        return self._call('seek', offset, whence)
+
+    def tell(self):
+        return self._call('tell')
+
+    def truncate(self, size=None):
+        if size is None:
+            size = self.tell()
+        return self._call('truncate', size)
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            super(RemoteFile, self).close()
+        finally:
+            self._call('close')
+
+
+def remoteopen(client, handle, readahead=1 << 20, writebuffer=1 << 20):
+    """
+    Get a buffered file-like object for a file held open by the server.
+
+    Reads fetch at least `readahead` bytes at a time and writes are coalesced
+    until `writebuffer` bytes are pending, so iterating lines of a large file
+    does not issue a request per line.
+
+    Parameters
+    ----------
+    client : rio.pipes.Client
+    handle : FileHandle
+    readahead : int
+    writebuffer : int
+
+    Returns
+    -------
+    io.IOBase
+    """
+    raw = RemoteFile(client, handle)
+    if handle.readable and handle.writable:
+        f = io.BufferedRandom(raw, max(readahead, writebuffer))
+    elif handle.writable:
+        f = io.BufferedWriter(raw, writebuffer)
+    else:
+        f = io.BufferedReader(raw, readahead)
+    # Python 2 text files read and write `str` which is already bytes.
+    if not handle.binary and not PY2:
+        f = io.TextIOWrapper(f, encoding=handle.encoding,
+                             errors=handle.errors)
+    return f
@@ -0,0 +1,72 @@
+"""
+Helpers for collecting results of asynchronous calls made with
+`Client.submit`.
+"""
+from __future__ import absolute_import, print_function
+
+import gevent
+
+from typing import Any, Iterable, Iterator, List, Optional
+
+
+__all__ = [
+    'gather',
+    'as_completed',
+]
+
+
+def as_completed(futures, timeout=None):
+    """
+    Yield futures as they complete.
+
+    Parameters
+    ----------
+    futures : Iterable[gevent.event.AsyncResult]
+    timeout : Optional[float]
+        Maximum number of seconds to wait for all futures.
+
+    Returns
+    -------
+    Iterator[gevent.event.AsyncResult]
+
+    Raises
+    ------
+    gevent.Timeout
+        If not all futures completed within `timeout`.
+    """
+    futures = list(futures)
+    count = 0
+    for future in gevent.iwait(futures, timeout=timeout):
+        count += 1
+        yield future
+    if count < len(futures):
+        raise gevent.Timeout(timeout)
+
+
+def gather(futures, timeout=None, return_exceptions=False):
+    """
+    Wait for all futures and return their results in order.
+
+    Parameters
+    ----------
+    futures : Iterable[gevent.event.AsyncResult]
+    timeout : Optional[float]
+        Maximum number of seconds to wait for all futures.
+    return_exceptions : bool
+        Return exceptions in place of results instead of raising the first
+        one encountered.
+
+    Returns
+    -------
+    List[Any]
+    """
+    futures = list(futures)
+    for _ in as_completed(futures, timeout=timeout):
+        pass
+    results = []
+    for future in futures:
+        if return_exceptions and not future.successful():
+            results.append(future.exception)
+        else:
+            results.append(future.get())
+    return results
@@ -1,12 +1,20 @@
 import sys
 import inspect
+import weakref
 import functools
 
+import gevent
+import gevent.event
+import gevent.local
+import gevent.pool
 import zerorpc
 
 from kids.cache import undecorate, cache
 
 from .serialize import Encoder
+from .watch import watch
+from .files import FileHandle, FileHandles, remoteopen
+from .log import get_logger
 
 try:
     from typing import ModuleType
@@ -14,12 +22,15 @@ except ImportError:
     ModuleType = type(sys)
 
 
+_logger = get_logger(__name__)
+
+
 def _fetch(value):
     # passthrough used for wrapping non-methods
     return value
 
 
-def _serialization_wrapper(func_or_value, encoder):
+def _serialization_wrapper(func_or_value, encoder, files=None):
     """
     Wrap `func_or_value` to be used by zerorpc. This handles encoding/decoding
     args and kwargs and wrapping with the proper zerorpc decorator.
@@ -31,6 +42,9 @@ def _serialization_wrapper(func_or_value, encoder):
         as well.
     encoder : Encoder
         Used to encode/decode args and kwargs.
+    files : Optional[FileHandles]
+        If provided, file objects returned by `func_or_value` are held open
+        and a `FileHandle` is returned in their place.
 
     Returns
     -------
@@ -47,7 +61,10 @@ def _serialization_wrapper(func_or_value, encoder):
     @functools.wraps(wrapped)
     def wrap(*args):
         args, kwargs = encoder.decode(*args)
-        return encoder.serializer.serialize(wrapped(*args, **kwargs))
+        result = wrapped(*args, **kwargs)
+        if files is not None and files.isfile(result):
+            result = files.add(result)
+        return encoder.serializer.serialize(result)
 
     @functools.wraps(wrapped)
     def iterwrap(*args):
@@ -131,10 +148,17 @@ class Server(zerorpc.Server):
         if methods is None:
             methods = self
 
+        # Greenlets serving long-lived streams such as `_watch`.
+        self._streams = set()
+        # Per-request state, such as the identity of the requesting client.
+        self._local = gevent.local.local()
+        self._files = FileHandles(
+            owner=lambda: getattr(self._local, 'client', None))
+
         _methods = self._filter_methods(Server, self, methods)
         # Do this before wrapping with serialization / decorators
         self._schema = {k: Schema.get(v) for k, v in _methods.items()}
-        _methods = {k: _serialization_wrapper(v, self.encoder)
+        _methods = {k: _serialization_wrapper(v, self.encoder, self._files)
                     for k, v in _methods.items()
                     if not isinstance(v, ModuleType)}
 
@@ -163,6 +187,93 @@ class Server(zerorpc.Server):
     def _inject_builtins(self):
         super(Server, self)._inject_builtins()
         self._methods['_schema'] = lambda: self._schema
+        self._methods['_batch'] = self._batch
+        self._methods['_watch'] = zerorpc.stream(self._watch)
+        self._methods['_file'] = self._files
+        self._methods['_fsession'] = zerorpc.stream(self._fsession)
+
+    def _fsession(self):
+        """
+        Stream that stays open while a client has files open. Once the client
+        disconnects (or its heartbeat is lost) all of its files are closed.
+
+        Returns
+        -------
+        Iterator[None]
+        """
+        client = getattr(self._local, 'client', None)
+        self._streams.add(gevent.getcurrent())
+        try:
+            yield None
+            gevent.event.Event().wait()
+        finally:
+            self._streams.discard(gevent.getcurrent())
+            self._files.closeall(client)
+
+    def _watch(self, prefixes, interval=1.0):
+        """
+        Stream lists of paths that changed under `prefixes`.
+
+        An empty list is sent first to acknowledge the subscription.
+
+        Parameters
+        ----------
+        prefixes : List[str]
+        interval : float
+            Seconds between scans if the server has to poll for changes.
+
+        Returns
+        -------
+        Iterator[List[str]]
+        """
+        watcher = watch(prefixes, interval=interval)
+        self._streams.add(gevent.getcurrent())
+        try:
+            yield []
+            for paths in watcher:
+                yield paths
+        finally:
+            self._streams.discard(gevent.getcurrent())
+            watcher.close()
+
+    def stop(self):
+        # Long-lived streams never finish on their own so end them now rather
+        # than waiting for their clients' heartbeats to be lost.
+        for greenlet in list(self._streams):
+            greenlet.kill(block=False)
+        super(Server, self).stop()
+
+    def _batch(self, calls):
+        """
+        Execute a list of queued calls within a single request.
+
+        Each call is executed in order and its result (or exception) is
+        serialized individually so one failing call does not fail the batch.
+
+        Parameters
+        ----------
+        calls : List[Tuple[str, Tuple[Any, Any]]]
+            Method names paired with their `Encoder.encode` payloads.
+
+        Returns
+        -------
+        List[Tuple[str, Any]]
+            A status ('OK', 'ERR' or 'STREAM') and serialized value per call.
+        """
+        results = []
+        for method, payload in calls:
+            try:
+                functor = self._methods.get(method, None)
+                if functor is None or method.startswith('_'):
+                    raise NameError(method)
+                if isinstance(functor, zerorpc.stream):
+                    # Streams are materialized since the batch replies once.
+                    results.append((u'STREAM', list(functor(*payload))))
+                else:
+                    results.append((u'OK', functor(*payload)))
+            except Exception as e:
+                results.append((u'ERR', self.encoder.serializer.serialize(e)))
+        return results
 
     def _async_task(self, initial_event):
         # Override method to completely serialize exceptions. By default
@@ -173,6 +284,8 @@ class Server(zerorpc.Server):
         # and change how they operate based on that.
 
         protocol_v1 = initial_event.header.get(u'v', 1) < 2
+        self._local.client = tuple(
+            x.bytes for x in initial_event.identity or ())
         channel = self._multiplexer.channel(initial_event)
         hbchan = zerorpc.HeartBeatOnChannel(
             channel, freq=self._heartbeat_freq, passive=protocol_v1)
@@ -230,6 +343,79 @@ class ErrorHandlingMiddleware(object):
             return zerorpc.RemoteError('RemoteError', msg, None)
 
 
+class Batch(object):
+    """
+    Queues calls so they can be sent to the server as a single request.
+
+    Each queued call returns a `gevent.event.AsyncResult` which is resolved
+    once the batch is sent. Used as a context manager the batch is sent on
+    exit:
+
+        with client.batch() as batch:
+            results = [batch('os.path.exists', x) for x in paths]
+        exists = [x.get() for x in results]
+    """
+
+    def __init__(self, client):
+        """
+        Parameters
+        ----------
+        client : Client
+        """
+        self._client = client
+        self._calls = []  # type: List[Tuple[str, Any, gevent.event.AsyncResult]]
+
+    def __len__(self):
+        return len(self._calls)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.send()
+
+    def __call__(self, method, *args, **kwargs):
+        """
+        Queue a call to `method`.
+
+        Returns
+        -------
+        gevent.event.AsyncResult
+        """
+        if method.startswith('_'):
+            raise ValueError('Cannot batch private method {!r}'.format(method))
+        result = gevent.event.AsyncResult()
+        payload = self._client.encoder.encode(*args, **kwargs)
+        self._calls.append((method, payload, result))
+        return result
+
+    def send(self):
+        """
+        Send all queued calls in one request and resolve their results.
+        """
+        calls, self._calls = self._calls, []
+        if not calls:
+            return
+
+        try:
+            replies = self._client._nonserialized_call(
+                '_batch', [(method, payload) for method, payload, _ in calls])
+        except Exception as e:
+            for _, _, result in calls:
+                result.set_exception(e)
+            raise
+
+        deserialize = self._client.encoder.serializer.deserialize
+        for (_, _, result), (status, value) in zip(calls, replies):
+            if status == u'ERR':
+                result.set_exception(deserialize(value))
+            elif status == u'STREAM':
+                result.set([deserialize(x) for x in value])
+            else:
+                result.set(deserialize(value))
+
+
 class Client(zerorpc.Client):
     """
     Modified zerorpc client that adds extra functionality.
@@ -241,6 +427,16 @@ class Client(zerorpc.Client):
             encoder = Encoder()
         self.encoder = encoder
 
+        # Bounds the number of concurrent calls issued via `submit`.
+        self._submit_pool = gevent.pool.Pool(
+            size=kwargs.pop('max_in_flight', 64))
+
+        # Buffer sizes of remote files.
+        self._readahead = kwargs.pop('readahead', 1 << 20)
+        self._writebuffer = kwargs.pop('writebuffer', 1 << 20)
+        self._files = weakref.WeakSet()
+        self._fsession = None  # type: Optional[gevent.Greenlet]
+
         super(Client, self).__init__(*args, **kwargs)
 
         self._context.register_middleware(
@@ -252,6 +448,13 @@ class Client(zerorpc.Client):
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.close()
 
+    def close(self):
+        self._closefiles()
+        if self._fsession is not None:
+            self._fsession.kill()
+            self._fsession = None
+        super(Client, self).close()
+
     def __repr__(self):
         return '<{}.{}({!r})>'.format(
             self.__module__, self.__class__.__name__, self._name)
@@ -271,12 +474,81 @@ class Client(zerorpc.Client):
     def _methods(self):
         return self('_zerorpc_list')
 
+    def batch(self):
+        """
+        Get a new batch for sending many calls in a single round-trip.
+
+        Returns
+        -------
+        Batch
+        """
+        return Batch(self)
+
+    def submit(self, method, *args, **kwargs):
+        """
+        Call `method` asynchronously.
+
+        Blocks while the client already has `max_in_flight` calls pending.
+        Use `rio.futures.gather` or `rio.futures.as_completed` to collect
+        many results.
+
+        Returns
+        -------
+        gevent.event.AsyncResult
+        """
+        result = gevent.event.AsyncResult()
+        self._submit_pool.spawn(self, method, *args, **kwargs).link(result)
+        return result
+
+    def _session(self):
+        # Hold a `_fsession` stream open so the server closes our files if we
+        # disconnect without closing them.
+        try:
+            for _ in self('_fsession'):
+                pass
+        except Exception as e:
+            _logger.debug('Lost file session: {}'.format(e))
+        self._fsession = None
+
+    def _openfile(self, handle):
+        """
+        Get a buffered file-like object for a file held open by the server.
+
+        Parameters
+        ----------
+        handle : FileHandle
+
+        Returns
+        -------
+        io.IOBase
+        """
+        if self._fsession is None:
+            self._fsession = gevent.spawn(self._session)
+        f = remoteopen(self, handle, readahead=self._readahead,
+                       writebuffer=self._writebuffer)
+        self._files.add(f)
+        return f
+
+    def _closefiles(self):
+        """
+        Close all remote files opened by this client.
+        """
+        for f in list(self._files):
+            try:
+                f.close()
+            except Exception as e:
+                _logger.warning('Error closing {!r}: {}'.format(f, e))
+        self._files.clear()
+
     def _nonserialized_call(self, method, *args, **kwargs):
         return super(Client, self).__call__(method, *args, **kwargs)
 
     def _serialized_call(self, method, *args, **kwargs):
+        if kwargs.pop('async', False):
+            return self.submit(method, *args, **kwargs)
+
         kw = {}
-        for k in ('timeout', 'slotes', 'async'):
+        for k in ('timeout', 'slotes'):
             try:
                 kw[k] = kwargs.pop(k)
             except KeyError:
@@ -284,8 +556,11 @@ class Client(zerorpc.Client):
 
         payload = self.encoder.encode(*args, **kwargs)
 
-        return self.encoder.serializer.deserialize(
+        result = self.encoder.serializer.deserialize(
             super(Client, self).__call__(method, *payload, **kw))
+        if isinstance(result, FileHandle):
+            return self._openfile(result)
+        return result
 
     def __call__(self, method, *args, **kwargs):
         # Private methods we don't bother serializing since they take extra
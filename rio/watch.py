@@ -0,0 +1,240 @@
+"""
+File system change watchers used to notify clients of modified paths.
+"""
+from __future__ import absolute_import, print_function
+
+import os
+import sys
+import errno
+import struct
+import ctypes
+import ctypes.util
+
+import gevent
+from gevent.socket import wait_read
+
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .log import get_logger
+
+
+_logger = get_logger(__name__)
+
+
+__all__ = [
+    'watch',
+    'InotifyWatcher',
+    'PollingWatcher',
+]
+
+
+_fsdecode = getattr(os, 'fsdecode', lambda x: x)
+
+
+class PollingWatcher(object):
+    """
+    Watches paths by periodically scanning them for changes.
+
+    This works everywhere but the cost of each scan grows with the number of
+    paths being watched.
+    """
+
+    def __init__(self, prefixes, interval=1.0):
+        """
+        Parameters
+        ----------
+        prefixes : Iterable[str]
+            Paths to watch recursively.
+        interval : float
+            Seconds between scans.
+        """
+        self.prefixes = list(prefixes)
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self):
+        snapshot = {}  # type: Dict[str, Tuple[float, int, int]]
+        for prefix in self.prefixes:
+            if not os.path.lexists(prefix):
+                continue
+            for root, dirs, files in os.walk(prefix):
+                for name in [root] + [os.path.join(root, x)
+                                      for x in dirs + files]:
+                    try:
+                        st = os.lstat(name)
+                    except OSError:
+                        continue
+                    snapshot[name] = (st.st_mtime, st.st_size, st.st_ino)
+                # Yield to other greenlets while scanning large trees.
+                gevent.sleep(0)
+        return snapshot
+
+    def __iter__(self):
+        """
+        Yield lists of changed paths.
+
+        Returns
+        -------
+        Iterator[List[str]]
+        """
+        while True:
+            gevent.sleep(self.interval)
+            snapshot = self._scan()
+            changed = [k for k in set(snapshot).union(self._snapshot)
+                       if snapshot.get(k) != self._snapshot.get(k)]
+            self._snapshot = snapshot
+            if changed:
+                yield changed
+
+    def close(self):
+        self._snapshot = {}
+
+
+class InotifyWatcher(object):
+    """
+    Watches paths using the Linux inotify API.
+    """
+
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_IGNORED = 0x00008000
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+
+    MASK = IN_MODIFY | IN_ATTRIB | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE \
+        | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+
+    _header = struct.Struct('iIII')
+
+    _libc = None
+
+    @classmethod
+    def available(cls):
+        """
+        Returns
+        -------
+        bool
+        """
+        if not sys.platform.startswith('linux'):
+            return False
+        if cls._libc is None:
+            try:
+                libc = ctypes.CDLL(
+                    ctypes.util.find_library('c') or 'libc.so.6',
+                    use_errno=True)
+                libc.inotify_init1
+            except (OSError, AttributeError):
+                return False
+            cls._libc = libc
+        return True
+
+    def __init__(self, prefixes):
+        """
+        Parameters
+        ----------
+        prefixes : Iterable[str]
+            Paths to watch recursively.
+        """
+        if not self.available():
+            raise OSError(errno.ENOSYS, 'inotify is not available')
+        self.prefixes = list(prefixes)
+        self._fd = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self._wds = {}  # type: Dict[int, str]
+        for prefix in self.prefixes:
+            self._addtree(prefix)
+
+    def _add(self, path):
+        if not isinstance(path, bytes):
+            path = path.encode(sys.getfilesystemencoding())
+        wd = self._libc.inotify_add_watch(self._fd, path, self.MASK)
+        if wd < 0:
+            _logger.debug('Unable to watch {!r}: {}'.format(
+                path, os.strerror(ctypes.get_errno())))
+            return
+        self._wds[wd] = _fsdecode(path)
+
+    def _addtree(self, path):
+        if not os.path.lexists(path):
+            return
+        self._add(path)
+        for root, dirs, _ in os.walk(path):
+            for name in dirs:
+                self._add(os.path.join(root, name))
+
+    def _read(self):
+        while True:
+            try:
+                return os.read(self._fd, 65536)
+            except OSError as e:
+                if e.errno != errno.EAGAIN:
+                    raise
+            wait_read(self._fd)
+
+    def __iter__(self):
+        """
+        Yield lists of changed paths.
+
+        Returns
+        -------
+        Iterator[List[str]]
+        """
+        while self._fd is not None:
+            data = self._read()
+            changed = []
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = self._header.unpack_from(data, offset)
+                offset += self._header.size
+                name = _fsdecode(data[offset:offset + length].rstrip(b'\0'))
+                offset += length
+
+                root = self._wds.get(wd)
+                if root is None:
+                    continue
+                if mask & self.IN_IGNORED:
+                    del self._wds[wd]
+                    continue
+                path = os.path.join(root, name) if name else root
+                if mask & self.IN_ISDIR \
+                        and mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                    self._addtree(path)
+                if path not in changed:
+                    changed.append(path)
+            if changed:
+                yield changed
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+def watch(prefixes, interval=1.0):
+    """
+    Get the best available watcher for `prefixes`.
+
+    Parameters
+    ----------
+    prefixes : Iterable[str]
+    interval : float
+        Seconds between scans if falling back to polling.
+
+    Returns
+    -------
+    Union[InotifyWatcher, PollingWatcher]
+    """
+    if InotifyWatcher.available():
+        try:
+            return InotifyWatcher(prefixes)
+        except OSError as e:
+            _logger.warning('Falling back to polling watcher: {}'.format(e))
+    return PollingWatcher(prefixes, interval=interval)
@@ -0,0 +1,86 @@
+import errno
+
+import pytest
+
+from rio.cache import MetadataCache
+
+
+class Remote(object):
+    """
+    Records calls as they would be sent to a server.
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, method, *args, **kwargs):
+        self.calls.append((method, args))
+        if args and args[0] == '/missing':
+            raise OSError(errno.ENOENT, 'No such file', args[0])
+        return method, args
+
+
+@pytest.fixture
+def remote():
+    return Remote()
+
+
+@pytest.fixture
+def cache():
+    return MetadataCache(
+        ttls={'os.stat': 60.0, 'os.listdir': 60.0},
+        mutators={'os.mkdir': lambda args, kwargs: args[:1]},
+        maxsize=2)
+
+
+def test_hit(cache, remote):
+    assert cache.call(remote, 'os.stat', '/foo') == ('os.stat', ('/foo',))
+    assert cache.call(remote, 'os.stat', '/foo') == ('os.stat', ('/foo',))
+    assert len(remote.calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_uncached_method(cache, remote):
+    cache.call(remote, 'os.readlink', '/foo')
+    cache.call(remote, 'os.readlink', '/foo')
+    assert len(remote.calls) == 2
+
+
+def test_ttl(cache, remote):
+    cache.ttls['os.stat'] = -1.0
+    cache.call(remote, 'os.stat', '/foo')
+    cache.call(remote, 'os.stat', '/foo')
+    assert len(remote.calls) == 2
+
+
+def test_lru(cache, remote):
+    cache.call(remote, 'os.stat', '/a')
+    cache.call(remote, 'os.stat', '/b')
+    cache.call(remote, 'os.stat', '/a')
+    cache.call(remote, 'os.stat', '/c')
+    assert len(cache) == 2
+    cache.call(remote, 'os.stat', '/a')
+    cache.call(remote, 'os.stat', '/b')
+    assert [x[1][0] for x in remote.calls] == ['/a', '/b', '/c', '/b']
+
+
+def test_negative(cache, remote):
+    for _ in range(2):
+        with pytest.raises(OSError):
+            cache.call(remote, 'os.stat', '/missing')
+    assert len(remote.calls) == 1
+
+
+def test_invalidate(cache, remote):
+    cache.call(remote, 'os.listdir', '/foo')
+    cache.call(remote, 'os.stat', '/foo/bar')
+    cache.call(remote, 'os.mkdir', '/foo/bar')
+    assert len(cache) == 0
+    cache.call(remote, 'os.stat', '/foo/bar')
+    assert len(remote.calls) == 4
+
+
+def test_unhashable(cache, remote):
+    cache.call(remote, 'os.stat', ['/foo'])
+    cache.call(remote, 'os.stat', ['/foo'])
+    assert len(remote.calls) == 2
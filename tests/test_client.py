@@ -11,8 +11,9 @@ import pytest
 
 import rio.server
 import rio.api
+import rio.futures
 from rio.collections.fs import iterfsmethods
-from rio.pipes import ProxyModule
+from rio.pipes import ProxyModule, Server
 
 import mymodule
 
@@ -75,11 +76,36 @@ class TestSchema(object):
             with pytest.raises(ValueError):
                 mymodule.raise_error()
 
+    @staticmethod
+    def test_batch(client):
+        with client.batch() as batch:
+            a = batch('tests.mymodule.a')
+            b = batch('tests.mymodule.b', 'foo', bar='spangle')
+            error = batch('tests.mymodule.raise_error')
+            assert len(batch) == 3
+        assert a.get() == 1
+        assert b.get() == (('foo',), {'bar': 'spangle'})
+        with pytest.raises(ValueError):
+            error.get()
+
+    @staticmethod
+    def test_submit(client):
+        futures = [client.submit('tests.mymodule.b', i) for i in range(10)]
+        futures.append(client.submit('tests.mymodule.raise_error'))
+        assert len(list(rio.futures.as_completed(futures, timeout=5))) == 11
+        results = rio.futures.gather(futures, return_exceptions=True)
+        assert results[:10] == [((i,), {}) for i in range(10)]
+        assert isinstance(results[10], ValueError)
+        with pytest.raises(ValueError):
+            rio.futures.gather(futures)
+
 
 TEST_PATH_EXISTS = '/tmp/rio_tests'
 TEST_CHILDPATH = '/tmp/rio_tests/child'
 TEST_PATH_NOT_EXISTS = '/tmp/rio_tests_not'
 
+_utime = os.utime
+
 
 def switcharoo(func):
 
@@ -209,3 +235,97 @@ class TestFS(object):
     @staticmethod
     def test_client(client):
         assert 'open' in client._methods
+
+    @staticmethod
+    def test_cache(path):
+        with rio.api.rio(CLIENT_SOCKET, timeout=1.0, cache=True) as client:
+            assert os.stat(path) == os.stat(path)
+            assert (client.cache.hits, client.cache.misses) == (1, 1)
+            os.utime(path, None)
+            assert len(client.cache) == 0
+
+    @staticmethod
+    def test_cache_watch():
+        client = rio.api.rio(CLIENT_SOCKET, timeout=1.0, cache=True,
+                             watch=[TEST_PATH_EXISTS])
+        key = client.cache.key('os.stat', (TEST_CHILDPATH,), {})
+        client.cache.call(lambda *args: 'stale', 'os.stat', TEST_CHILDPATH)
+        with client:
+            assert key in client.cache._entries
+            # Modify the path without going through the client.
+            _utime(TEST_CHILDPATH, None)
+            gevent.sleep(0.5)
+            assert key not in client.cache._entries
+
+
+TEST_FILE = '/tmp/rio_tests_file'
+
+
+class TestFiles(object):
+    """
+    Collection of remote file tests.
+    """
+
+    server = None
+    greenlet = None
+
+    @classmethod
+    def setup_class(cls):
+        cls.server = Server({'open': open}, name='rio')
+        cls.server.bind(SERVER_SOCKET)
+        cls.greenlet = gevent.spawn(cls.server.run)
+        gevent.sleep(0.5)
+        healthcheck(cls.greenlet)
+
+    @classmethod
+    def teardown_class(cls):
+        cls.server.close()
+        cls.greenlet.kill()
+        if os.path.exists(TEST_FILE):
+            os.remove(TEST_FILE)
+
+    @staticmethod
+    def test_write_read(client):
+        lines = ['line {}\n'.format(i) for i in range(1000)]
+        with client:
+            with open(TEST_FILE, 'w') as f:
+                assert f.writable()
+                for line in lines:
+                    f.write(line)
+            with open(TEST_FILE) as f:
+                assert list(f) == lines
+                f.seek(0)
+                assert f.read(4) == 'line'
+                f.seek(-4, os.SEEK_END)
+                assert f.read() == '999\n'
+        with open(TEST_FILE) as f:
+            assert f.readlines() == lines
+
+    @staticmethod
+    def test_readinto(client):
+        with client:
+            with open(TEST_FILE, 'wb') as f:
+                f.write(b'0123456789')
+            with open(TEST_FILE, 'rb') as f:
+                b = bytearray(4)
+                assert f.readinto(b) == 4
+                assert b == bytearray(b'0123')
+
+    @classmethod
+    def test_closed_on_exit(cls, client):
+        with client:
+            f = open(TEST_FILE, 'a+b')
+            f.write(b'abc')
+            assert len(cls.server._files) == 1
+        assert f.closed
+        assert len(cls.server._files) == 0
+
+    @classmethod
+    def test_closed_on_disconnect(cls, client):
+        f = client('open', TEST_FILE, 'rb')
+        gevent.sleep(0.1)
+        assert len(cls.server._files) == 1
+        client._fsession.kill()
+        cls.server.stop()
+        assert len(cls.server._files) == 0
+        cls.greenlet = gevent.spawn(cls.server.run)
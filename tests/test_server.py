@@ -75,3 +75,17 @@ def test_schema_module(moduleserver):
     assert schema['tests.mymodule.CustomPath'] == Schema.CALLABLE
     assert schema['tests.mymodule.a'] == Schema.CALLABLE
     assert schema['tests.mymodule.CONST'] == Schema.VALUE
+
+
+def test_batch(methodserver, encoder):
+    calls = [
+        ('a', encoder.encode()),
+        ('b', encoder.encode('foo', bar='spangle')),
+        ('missing', encoder.encode()),
+    ]
+    results = methodserver._methods['_batch'](calls)
+    assert [status for status, _ in results] == ['OK', 'OK', 'ERR']
+    assert encoder.serializer.deserialize(results[0][1]) == 1
+    assert encoder.serializer.deserialize(results[1][1]) == \
+        (('foo',), {'bar': 'spangle'})
+    assert isinstance(encoder.serializer.deserialize(results[2][1]), NameError)
@@ -0,0 +1,45 @@
+import os
+import shutil
+import tempfile
+
+import gevent
+import pytest
+
+from rio.watch import InotifyWatcher, PollingWatcher
+
+
+@pytest.fixture
+def root():
+    path = tempfile.mkdtemp()
+    os.mkdir(os.path.join(path, 'sub'))
+    yield path
+    shutil.rmtree(path)
+
+
+def _changes(watcher, func):
+    watching = gevent.spawn(next, iter(watcher))
+    gevent.sleep(0.1)
+    func()
+    try:
+        return watching.get(timeout=5)
+    finally:
+        watcher.close()
+
+
+@pytest.fixture(params=['inotify', 'polling'])
+def watcher(request, root):
+    if request.param == 'inotify':
+        if not InotifyWatcher.available():
+            pytest.skip('inotify is not available')
+        return InotifyWatcher([root])
+    return PollingWatcher([root], interval=0.05)
+
+
+def test_create(watcher, root):
+    path = os.path.join(root, 'sub', 'new')
+    assert path in _changes(watcher, lambda: open(path, 'w').close())
+
+
+def test_remove(watcher, root):
+    path = os.path.join(root, 'sub')
+    assert path in _changes(watcher, lambda: os.rmdir(path))